@@ -1,107 +1,515 @@
 from abc import ABC, abstractmethod
-from collections import deque
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+
+import algorithms_jit
+import workload as workload_gen
+
+
+def _build_stats(page_hits, page_faults, formatted=True):
+    
+    total_requests = page_hits + page_faults
+    hit_ratio_raw = (page_hits / total_requests) if total_requests > 0 else 0
+    miss_ratio_raw = (page_faults / total_requests) if total_requests > 0 else 0
+    
+    stats = {
+        "Total Requests": total_requests,
+        "Page Faults": page_faults,
+        "Page Hits": page_hits,
+    }
+    if formatted:
+        stats["Hit Ratio"] = f"{hit_ratio_raw:.2%}"
+        stats["Miss Ratio"] = f"{miss_ratio_raw:.2%}"
+    stats["Hit Ratio (raw)"] = hit_ratio_raw
+    stats["Miss Ratio (raw)"] = miss_ratio_raw
+    return stats
+
+
+# Compact timeline storage: event is 0 for a hit and 1 for a fault, and
+# evicted holds NO_PAGE when the fault did not evict anything. Pages must be
+# non-negative integers to be stored this way.
+TIMELINE_DTYPE = np.dtype([('step', 'i8'), ('page', 'i8'), ('event', 'u1'), ('evicted', 'i8')])
+HIT = 0
+FAULT = 1
+
+
+def _storable(page):
+    return isinstance(page, (int, np.integer)) and not isinstance(page, bool) and page >= 0
+
+
+def _storable_pages(context):
+    mapped = context.page_ids
+    return mapped is not None and (not len(mapped[0]) or mapped[0][0] >= 0)
+
+
+class TimelineArray:
+    __slots__ = ('_events', '_n')
+
+    def __init__(self, capacity):
+        self._events = np.zeros(max(capacity, 1), dtype=TIMELINE_DTYPE)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def _reserve(self, size):
+        if size > len(self._events):
+            grown = np.zeros(max(size, 2 * len(self._events)), dtype=TIMELINE_DTYPE)
+            grown[:self._n] = self._events[:self._n]
+            self._events = grown
+
+    def append(self, entry):
+        step, page, event, _, evicted = entry
+        for value in (page, evicted):
+            if value is not None and not _storable(value):
+                raise ValueError(f"TimelineArray only stores non-negative integer pages, got {value!r}.")
+        self._reserve(self._n + 1)
+        self._events[self._n] = (step, page,
+                                 FAULT if event == "Fault" else HIT,
+                                 algorithms_jit.NO_PAGE if evicted is None else evicted)
+        self._n += 1
+
+    def extend(self, steps, pages, events, evicted):
+        start = self._n
+        self._reserve(start + len(steps))
+        block = self._events[start:start + len(steps)]
+        block['step'] = steps
+        block['page'] = pages
+        block['event'] = events
+        block['evicted'] = evicted
+        self._n += len(steps)
+
+    @property
+    def events(self):
+        return self._events[:self._n]
+
+    def __iter__(self):
+        events = self.events
+        for step, page, event, evicted in zip(events['step'].tolist(), events['page'].tolist(),
+                                              events['event'].tolist(), events['evicted'].tolist()):
+            if event == FAULT:
+                yield (step, page, "Fault", page, None if evicted == algorithms_jit.NO_PAGE else evicted)
+            else:
+                yield (step, page, "Hit", None, None)
+
+
+class DiscardedTimeline:
+    # Stands in for the timeline on stats-only runs; entries are dropped.
+    __slots__ = ()
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+    def append(self, entry):
+        pass
+
+
+class SimContext:
+    # Per-trace data shared by every simulation over the same workload, so a
+    # comparison sweep maps page ids and next uses once instead of per run.
+    __slots__ = ('pages', '_page_ids', '_page_list', '_next_use')
+
+    def __init__(self, workload):
+        self.pages = workload
+        self._page_ids = self._page_list = self._next_use = None
+
+    @property
+    def page_ids(self):
+        if self._page_ids is None:
+            mapped = algorithms_jit.to_page_ids(self.pages)
+            self._page_ids = False if mapped is None else mapped
+        return self._page_ids or None
+
+    @property
+    def page_list(self):
+        if self._page_list is None:
+            self._page_list = self.page_ids[0].tolist()
+        return self._page_list
+
+    @property
+    def next_use(self):
+        if self._next_use is None:
+            mapped = self.page_ids if algorithms_jit.NUMBA_AVAILABLE else None
+            if mapped is not None:
+                uniques, ids = mapped
+                self._next_use = algorithms_jit.next_use_kernel(ids, len(uniques))
+            else:
+                self._next_use = workload_gen.precompute_next_use(self.pages)
+        return self._next_use
 
 
 class PageReplacementAlgorithm(ABC):
+    __slots__ = ('num_frames', 'frames', '_frame_set', 'page_faults', 'page_hits', 'step', 'timeline')
+
+    promotes_on_hit = False
 
-    def __init__(self, num_frames):
+    def __init__(self, num_frames, expected_requests=None):
         if num_frames <= 0:
             raise ValueError("Number of frames must be positive.")
         self.num_frames = num_frames
         self.frames = []  
+        self._frame_set = set()
         self.page_faults = 0
         self.page_hits = 0
         self.step = 0          
-        self.timeline = []     
+        if expected_requests is None:
+            self.timeline = []     
+        else:
+            self.timeline = TimelineArray(expected_requests)
     @abstractmethod
     def process_page_request(self, page_number, workload_future=None):
         
         pass
 
-    def get_stats(self):
+    _run_kernel = None
+
+    def run_workload(self, workload, context=None, record_timeline=True):
+        # With record_timeline off only the counters and frames are kept, and
+        # get_timeline() has nothing to report for this or later requests.
+        if context is None:
+            context = SimContext(workload)
+        if not record_timeline:
+            self.timeline = DiscardedTimeline()
+        elif isinstance(self.timeline, TimelineArray) and not len(self.timeline) and not _storable_pages(context):
+            self.timeline = []
+        if self._run_compiled(context, record_timeline):
+            return self.get_stats()
+        return self._process_context(context)
+
+    def _process_context(self, context):
+        return self.process_workload(context.pages)
+
+    def process_workload(self, workload):
         
-        total_requests = self.page_hits + self.page_faults
-        hit_ratio_raw = (self.page_hits / total_requests) if total_requests > 0 else 0
-        miss_ratio_raw = (self.page_faults / total_requests) if total_requests > 0 else 0
+        process = self.process_page_request
+        for page_number in workload:
+            process(page_number)
+        return self.get_stats()
+
+    def _run_compiled(self, context, record_timeline=True):
+        
+        if self._run_kernel is None or not algorithms_jit.NUMBA_AVAILABLE or self.step != 0:
+            return False
+        mapped = context.page_ids
+        if mapped is None:
+            return False
+
+        uniques, ids = mapped
+        page_of = context.page_list
+        result = self._run_kernel(ids, len(page_of), context, record_timeline)
+        hits, faults, kernel_timeline = result[0], result[1], result[2]
+
+        self.page_hits = int(hits)
+        self.page_faults = int(faults)
+        self.step = len(ids)
+        if record_timeline:
+            # The kernel rows stay in array form; get_timeline() only builds
+            # tuples when a report actually asks for them. TimelineArray cannot
+            # hold negative pages, which keep the per-request tuple list.
+            if not isinstance(self.timeline, TimelineArray) and _storable_pages(context):
+                self.timeline = TimelineArray(len(ids))
+            if isinstance(self.timeline, TimelineArray):
+                evicted_ids = kernel_timeline[:, 3]
+                has_evicted = evicted_ids != algorithms_jit.NO_PAGE
+                evicted = np.full(len(evicted_ids), algorithms_jit.NO_PAGE, dtype=np.int64)
+                evicted[has_evicted] = uniques[evicted_ids[has_evicted]]
+                self.timeline.extend(kernel_timeline[:, 0], uniques[kernel_timeline[:, 1]],
+                                     kernel_timeline[:, 2], evicted)
+            else:
+                for step, page, is_fault, evicted in kernel_timeline.tolist():
+                    page = page_of[page]
+                    if is_fault:
+                        evicted = page_of[evicted] if evicted != algorithms_jit.NO_PAGE else None
+                        self.timeline.append((step, page, "Fault", page, evicted))
+                    else:
+                        self.timeline.append((step, page, "Hit", None, None))
+
+        self._restore_state(page_of, result)
+        return True
+
+    def raw_stats(self):
+        
+        return self.page_faults, self.page_hits, self.page_faults + self.page_hits
+
+    def get_stats_raw(self):
+        
+        return _build_stats(self.page_hits, self.page_faults, formatted=False)
+
+    def get_stats(self, formatted=True):
+        
+        return _build_stats(self.page_hits, self.page_faults, formatted)
+
+    def _iter_frame_states(self):
         
-        return {
-            "Total Requests": total_requests,
-            "Page Faults": self.page_faults,
-            "Page Hits": self.page_hits,
-            "Hit Ratio": f"{hit_ratio_raw:.2%}",
-            "Miss Ratio": f"{miss_ratio_raw:.2%}",
-            "Hit Ratio (raw)": hit_ratio_raw,
-            "Miss Ratio (raw)": miss_ratio_raw
-        }
+        frames = OrderedDict()
+        for entry in self.timeline:
+            step, page, event, added, evicted = entry
+            if evicted is not None:
+                del frames[evicted]
+            if added is not None:
+                frames[added] = None
+            elif self.promotes_on_hit:
+                frames.move_to_end(page)
+            yield entry, frames
 
     def get_timeline(self):
-        return self.timeline
+        
+        timeline = []
+        for (step, page, event, _, evicted), frames in self._iter_frame_states():
+            if event == "Hit":
+                timeline.append((step, page, event, list(frames)))
+            else:
+                timeline.append((step, page, event, list(frames), evicted))
+        return timeline
 
 
 class FIFO(PageReplacementAlgorithm):
-    def __init__(self, num_frames):
-        super().__init__(num_frames)
-        self.queue = deque()
+    __slots__ = ('_ring', '_head', '_filled')
+
+    @property
+    def frames(self):
+        if self._filled < self.num_frames:
+            return self._ring[:self._filled]
+        return self._ring[self._head:] + self._ring[:self._head]
+
+    @frames.setter
+    def frames(self, pages):
+        pages = list(pages)
+        self._ring = pages + [None] * (self.num_frames - len(pages))
+        self._head = 0
+        self._filled = len(pages)
+
+    def _run_kernel(self, ids, num_pages, context, record_timeline):
+        return algorithms_jit.fifo_kernel(ids, self.num_frames, num_pages, record_timeline)
+
+    def _restore_state(self, page_of, result):
+        ring, head, filled = result[3:]
+        pages = [page_of[page] for page in ring[:filled].tolist()]
+        self._ring = pages + [None] * (self.num_frames - len(pages))
+        self._head = int(head)
+        self._filled = len(pages)
+        self._frame_set = set(pages)
+
+    def process_workload(self, workload):
+        
+        num_frames = self.num_frames
+        ring = self._ring
+        head = self._head
+        filled = self._filled
+        frame_set = self._frame_set
+        record = self.timeline.append
+        step = self.step
+        page_hits = self.page_hits
 
+        for page_number in workload:
+            step += 1
+            if page_number in frame_set:
+                page_hits += 1
+                record((step, page_number, "Hit", None, None))
+                continue
+
+            page_to_evict = None
+            if filled < num_frames:
+                ring[filled] = page_number
+                filled += 1
+            else:
+                page_to_evict = ring[head]
+                frame_set.discard(page_to_evict)
+                ring[head] = page_number
+                head = (head + 1) % num_frames
+            frame_set.add(page_number)
+            record((step, page_number, "Fault", page_number, page_to_evict))
+
+        self.page_faults += (step - self.step) - (page_hits - self.page_hits)
+        self.page_hits = page_hits
+        self.step = step
+        self._head = head
+        self._filled = filled
+        return self.get_stats()
 
     def process_page_request(self, page_number, workload_future=None):
         self.step += 1
-        if page_number in self.frames:
+        if page_number in self._frame_set:
             self.page_hits += 1
-            self.timeline.append((self.step, page_number, "Hit", list(self.frames)))
+            self.timeline.append((self.step, page_number, "Hit", None, None))
             return
 
         self.page_faults += 1
         page_to_evict = None
-        if len(self.frames) < self.num_frames:
-            self.frames.append(page_number)
-            self.queue.append(page_number)
+        if self._filled < self.num_frames:
+            self._ring[self._filled] = page_number
+            self._filled += 1
         else:
-            page_to_evict = self.queue.popleft()
-            self.frames.remove(page_to_evict)
-            self.frames.append(page_number)
-            self.queue.append(page_number)
+            page_to_evict = self._ring[self._head]
+            self._frame_set.discard(page_to_evict)
+            self._ring[self._head] = page_number
+            self._head = (self._head + 1) % self.num_frames
+        self._frame_set.add(page_number)
         
-        self.timeline.append((self.step, page_number, "Fault", list(self.frames), page_to_evict))
+        self.timeline.append((self.step, page_number, "Fault", page_number, page_to_evict))
 
 
 
 class LRU(PageReplacementAlgorithm):
-    def __init__(self, num_frames):
-        super().__init__(num_frames)
+    __slots__ = ('_od',)
 
+    promotes_on_hit = True
+
+    def __init__(self, num_frames, expected_requests=None):
+        super().__init__(num_frames, expected_requests)
+
+    @property
+    def frames(self):
+        return self._od
+
+    @frames.setter
+    def frames(self, pages):
+        self._od = OrderedDict.fromkeys(pages)
+
+    def _run_kernel(self, ids, num_pages, context, record_timeline):
+        return algorithms_jit.lru_kernel(ids, self.num_frames, num_pages, record_timeline)
+
+    def _restore_state(self, page_of, result):
+        oldest, nxt = result[3:]
+        nxt = nxt.tolist()
+        resident = []
+        page = int(oldest)
+        while page != algorithms_jit.NO_PAGE:
+            resident.append(page_of[page])
+            page = nxt[page]
+        self.frames = resident
+
+    def process_workload(self, workload):
+        
+        num_frames = self.num_frames
+        frames = self._od
+        move_to_end = frames.move_to_end
+        popitem = frames.popitem
+        record = self.timeline.append
+        step = self.step
+        page_hits = self.page_hits
+
+        for page_number in workload:
+            step += 1
+            if page_number in frames:
+                page_hits += 1
+                move_to_end(page_number)
+                record((step, page_number, "Hit", None, None))
+                continue
+
+            page_to_evict = None
+            if len(frames) >= num_frames:
+                page_to_evict, _ = popitem(last=False)
+            frames[page_number] = None
+            record((step, page_number, "Fault", page_number, page_to_evict))
+
+        self.page_faults += (step - self.step) - (page_hits - self.page_hits)
+        self.page_hits = page_hits
+        self.step = step
+        return self.get_stats()
    
     def process_page_request(self, page_number, workload_future=None):
         self.step += 1
-        if page_number in self.frames:
+        if page_number in self._od:
             self.page_hits += 1
-            self.frames.remove(page_number)
-            self.frames.append(page_number)
-            self.timeline.append((self.step, page_number, "Hit", list(self.frames)))
+            self._od.move_to_end(page_number)
+            self.timeline.append((self.step, page_number, "Hit", None, None))
             return
 
         self.page_faults += 1
         page_to_evict = None
-        if len(self.frames) < self.num_frames:
-            self.frames.append(page_number)
-        else:
-            page_to_evict = self.frames.pop(0) 
-            self.frames.append(page_number)
+        if len(self._od) >= self.num_frames:
+            page_to_evict, _ = self._od.popitem(last=False)
+        self._od[page_number] = None
             
-        self.timeline.append((self.step, page_number, "Fault", list(self.frames), page_to_evict))
+        self.timeline.append((self.step, page_number, "Fault", page_number, page_to_evict))
 
 
 
 class Optimal(PageReplacementAlgorithm):
-    def __init__(self, num_frames):
-        super().__init__(num_frames)
+    __slots__ = ('_next_use',)
+    def __init__(self, num_frames, expected_requests=None):
+        super().__init__(num_frames, expected_requests)
+        self._next_use = {}
+
+    def _run_kernel(self, ids, num_pages, context, record_timeline):
+        return algorithms_jit.optimal_kernel(ids, self.num_frames, num_pages, context.next_use, record_timeline)
 
+    def _restore_state(self, page_of, result):
+        # Frames are kept in load order, like the Python path's list.
+        frame_page, frame_loaded, filled = result[3:]
+        order = np.argsort(frame_loaded[:filled], kind='stable')
+        self.frames = [page_of[page] for page in frame_page[:filled][order].tolist()]
+        self._frame_set = set(self.frames)
+
+    def _process_context(self, context):
+        return self.process_workload(context.pages, context.next_use)
+
+    def process_workload(self, workload, next_use=None):
+        
+        if next_use is None:
+            next_use = workload_gen.precompute_next_use(workload)
+        next_use = next_use.tolist()
+
+        num_frames = self.num_frames
+        frames = self.frames
+        frame_set = self._frame_set
+        record = self.timeline.append
+        step = self.step
+        page_hits = self.page_hits
+
+        resident_next_use = self._next_use
+        # Pages already resident from an earlier call are next used at their
+        # first request in this workload, if any.
+        pending = set(frames)
+        for page in pending:
+            resident_next_use[page] = len(next_use)
+        for position, page_number in enumerate(workload):
+            if not pending:
+                break
+            if page_number in pending:
+                resident_next_use[page_number] = position
+                pending.discard(page_number)
+
+        for position, page_number in enumerate(workload):
+            step += 1
+            resident_next_use[page_number] = next_use[position]
+            if page_number in frame_set:
+                page_hits += 1
+                record((step, page_number, "Hit", None, None))
+                continue
+
+            page_to_evict = None
+            if len(frames) < num_frames:
+                frames.append(page_number)
+            else:
+                furthest_index = -1
+                for page in frames:
+                    if resident_next_use[page] > furthest_index:
+                        page_to_evict = page
+                        furthest_index = resident_next_use[page]
+                del resident_next_use[page_to_evict]
+                frames.remove(page_to_evict)
+                frame_set.discard(page_to_evict)
+                frames.append(page_number)
+            frame_set.add(page_number)
+            record((step, page_number, "Fault", page_number, page_to_evict))
+
+        self.page_faults += (step - self.step) - (page_hits - self.page_hits)
+        self.page_hits = page_hits
+        self.step = step
+        return self.get_stats()
     
-    def process_page_request(self, page_number, workload_future):
+    def process_page_request(self, page_number, workload_future=None, start=0):
         self.step += 1
-        if page_number in self.frames:
+        if page_number in self._frame_set:
             self.page_hits += 1
-            self.timeline.append((self.step, page_number, "Hit", list(self.frames)))
+            self.timeline.append((self.step, page_number, "Hit", None, None))
             return
 
         self.page_faults += 1
@@ -109,69 +517,152 @@ class Optimal(PageReplacementAlgorithm):
         if len(self.frames) < self.num_frames:
             self.frames.append(page_number)
         else:
-            page_to_evict = self._find_furthest_used_page(workload_future)
+            page_to_evict = self._find_furthest_used_page(workload_future, start)
             self.frames.remove(page_to_evict)
+            self._frame_set.discard(page_to_evict)
             self.frames.append(page_number)
+        self._frame_set.add(page_number)
             
-        self.timeline.append((self.step, page_number, "Fault", list(self.frames), page_to_evict))
+        self.timeline.append((self.step, page_number, "Fault", page_number, page_to_evict))
 
-    def _find_furthest_used_page(self, future_workload):
-        next_use = {}
+    def _find_furthest_used_page(self, future_workload, start=0):
+        future_set = set(islice(future_workload, start, None))
+        furthest_page = None
+        furthest_index = -1
         for page in self.frames:
-            try:
-                future_index = future_workload.index(page)
-                next_use[page] = future_index
-            except ValueError:
+            if page not in future_set:
                 return page
-        return max(next_use, key=next_use.get)
+            future_index = future_workload.index(page, start)
+            if future_index > furthest_index:
+                furthest_page = page
+                furthest_index = future_index
+        return furthest_page
 
 
 
 class MGLRU(PageReplacementAlgorithm):
-    def __init__(self, num_frames, num_generations=4, aging_threshold=10):
-        super().__init__(num_frames)
+    __slots__ = ('num_generations', 'aging_threshold', 'generations', 'page_map', 'current_page_count',
+                 '_next_age_step', 'record_generations', 'generation_log')
+    def __init__(self, num_frames, num_generations=4, aging_threshold=10, record_generations=False,
+                 expected_requests=None):
+        super().__init__(num_frames, expected_requests)
         self.num_generations = num_generations
         self.aging_threshold = aging_threshold
         
-        self.generations = [deque() for _ in range(num_generations)]
+        self.generations = [OrderedDict() for _ in range(num_generations)]
         self.page_map = {}
         self.current_page_count = 0
-        self.age_tick_counter = 0
+        self._next_age_step = aging_threshold
         
         
+        self.record_generations = record_generations
         self.generation_log = [] 
         
 
+    def _run_kernel(self, ids, num_pages, context, record_timeline):
+        return algorithms_jit.mglru_kernel(ids, self.num_frames, num_pages,
+                                           self.num_generations, self.aging_threshold,
+                                           self.record_generations, record_timeline)
+
+    def _restore_state(self, page_of, result):
+        generation_sizes, _, head, nxt, next_age_step = result[3:]
+        nxt = nxt.tolist()
+
+        self.generations = []
+        self.page_map = {}
+        for g, first in enumerate(head.tolist()):
+            generation = OrderedDict()
+            page = first
+            while page != algorithms_jit.NO_PAGE:
+                generation[page_of[page]] = None
+                self.page_map[page_of[page]] = g
+                page = nxt[page]
+            self.generations.append(generation)
+
+        self.current_page_count = len(self.page_map)
+        self._next_age_step = int(next_age_step)
+        self.generation_log = [(step,) + tuple(sizes)
+                               for step, sizes in enumerate(generation_sizes.tolist(), 1)]
+
     def _age_pages(self):
         for i in range(self.num_generations - 2, -1, -1):
             if self.generations[i]:
-                page_to_age = self.generations[i].popleft()
+                page_to_age, _ = self.generations[i].popitem(last=False)
                 next_gen = i + 1
-                self.generations[next_gen].append(page_to_age)
+                self.generations[next_gen][page_to_age] = None
                 self.page_map[page_to_age] = next_gen
                 return
 
+    def process_workload(self, workload):
+        
+        num_frames = self.num_frames
+        num_generations = self.num_generations
+        aging_threshold = self.aging_threshold
+        generations = self.generations
+        youngest = generations[0]
+        page_map = self.page_map
+        record = self.timeline.append
+        log_generations = self.generation_log.append if self.record_generations else None
+        next_age_step = self._next_age_step
+        step = self.step
+        page_hits = self.page_hits
+
+        for page_number in workload:
+            step += 1
+            if step >= next_age_step:
+                self._age_pages()
+                next_age_step = step + aging_threshold
+
+            current_gen = page_map.get(page_number, -1)
+            if current_gen != -1:
+                page_hits += 1
+                if current_gen != 0:
+                    del generations[current_gen][page_number]
+                    youngest[page_number] = None
+                    page_map[page_number] = 0
+                record((step, page_number, "Hit", None, None))
+            else:
+                page_to_evict = None
+                if len(page_map) == num_frames:
+                    for i in range(num_generations - 1, -1, -1):
+                        if generations[i]:
+                            page_to_evict, _ = generations[i].popitem(last=False)
+                            del page_map[page_to_evict]
+                            break
+                youngest[page_number] = None
+                page_map[page_number] = 0
+                record((step, page_number, "Fault", page_number, page_to_evict))
+
+            if log_generations is not None:
+                log_generations((step,) + tuple([len(gen) for gen in generations]))
+
+        self.page_faults += (step - self.step) - (page_hits - self.page_hits)
+        self.page_hits = page_hits
+        self.step = step
+        self._next_age_step = next_age_step
+        self.current_page_count = len(page_map)
+        return self.get_stats()
+
     def process_page_request(self, page_number, workload_future=None):
         self.step += 1
         
-        self.age_tick_counter += 1
-        if self.age_tick_counter >= self.aging_threshold:
+        if self.step >= self._next_age_step:
             self._age_pages()
-            self.age_tick_counter = 0
+            self._next_age_step = self.step + self.aging_threshold
             
-        if page_number in self.page_map:
+        current_gen = self.page_map.get(page_number, -1)
+        if current_gen != -1:
             self.page_hits += 1
-            current_gen = self.page_map[page_number]
             if current_gen != 0:
-                self.generations[current_gen].remove(page_number)
-                self.generations[0].append(page_number)
+                del self.generations[current_gen][page_number]
+                self.generations[0][page_number] = None
                 self.page_map[page_number] = 0
             
-            current_frames = list(self.page_map.keys())
-            self.timeline.append((self.step, page_number, "Hit", current_frames))
+            self.timeline.append((self.step, page_number, "Hit", None, None))
             
             
-            self._log_generation_sizes()
+            if self.record_generations:
+                self._log_generation_sizes()
             
             return
 
@@ -180,20 +671,20 @@ class MGLRU(PageReplacementAlgorithm):
         if self.current_page_count == self.num_frames:
             for i in range(self.num_generations - 1, -1, -1):
                 if self.generations[i]:
-                    page_to_evict = self.generations[i].popleft()
+                    page_to_evict, _ = self.generations[i].popitem(last=False)
                     del self.page_map[page_to_evict]
                     self.current_page_count -= 1
                     break
 
-        self.generations[0].append(page_number)
+        self.generations[0][page_number] = None
         self.page_map[page_number] = 0
         self.current_page_count += 1
         
-        current_frames = list(self.page_map.keys())
-        self.timeline.append((self.step, page_number, "Fault", current_frames, page_to_evict))
+        self.timeline.append((self.step, page_number, "Fault", page_number, page_to_evict))
         
         
-        self._log_generation_sizes()
+        if self.record_generations:
+            self._log_generation_sizes()
        
 
    
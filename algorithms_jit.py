@@ -0,0 +1,372 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Timeline rows produced by the kernels: (step, page_id, is_fault, evicted_id),
+# with evicted_id == -1 when nothing was evicted. After the timeline, each
+# kernel also returns its final frame state so callers never have to replay
+# the timeline to find the resident pages. With record_timeline off, rows go
+# to a single scratch row and an empty timeline is returned.
+NO_PAGE = -1
+
+# Workloads whose page numbers are non-negative and below this bound (or below
+# the workload length) index the kernels' per-page arrays directly.
+DENSE_PAGE_LIMIT = 1 << 16
+
+
+def to_page_ids(workload):
+
+    pages = np.asarray(workload)
+    if pages.ndim != 1 or not np.issubdtype(pages.dtype, np.integer):
+        return None
+    if len(pages) and pages.min() >= 0:
+        max_page = int(pages.max())
+        if max_page < max(len(pages), DENSE_PAGE_LIMIT):
+            return np.arange(max_page + 1), pages.astype(np.int64)
+    uniques, ids = np.unique(pages, return_inverse=True)
+    return uniques, ids.astype(np.int64)
+
+
+@njit(cache=True)
+def fifo_kernel(ids, num_frames, num_pages, record_timeline=True):
+    n = len(ids)
+    timeline = np.empty((n if record_timeline else 1, 4), dtype=np.int64)
+    slot_of = np.full(num_pages, -1, dtype=np.int64)
+    ring = np.empty(num_frames, dtype=np.int64)
+    head = 0
+    filled = 0
+    hits = 0
+
+    for i in range(n):
+        page = ids[i]
+        row = i if record_timeline else 0
+        timeline[row, 0] = i + 1
+        timeline[row, 1] = page
+        timeline[row, 3] = NO_PAGE
+        if slot_of[page] >= 0:
+            hits += 1
+            timeline[row, 2] = 0
+            continue
+
+        timeline[row, 2] = 1
+        if filled < num_frames:
+            ring[filled] = page
+            slot_of[page] = filled
+            filled += 1
+        else:
+            victim = ring[head]
+            slot_of[victim] = -1
+            ring[head] = page
+            slot_of[page] = head
+            head = (head + 1) % num_frames
+            timeline[row, 3] = victim
+
+    return hits, n - hits, timeline[:n if record_timeline else 0], ring, head, filled
+
+
+@njit(cache=True)
+def lru_kernel(ids, num_frames, num_pages, record_timeline=True):
+    n = len(ids)
+    timeline = np.empty((n if record_timeline else 1, 4), dtype=np.int64)
+    resident = np.zeros(num_pages, dtype=np.bool_)
+    prev = np.full(num_pages, -1, dtype=np.int64)
+    nxt = np.full(num_pages, -1, dtype=np.int64)
+    oldest = -1
+    newest = -1
+    count = 0
+    hits = 0
+
+    for i in range(n):
+        page = ids[i]
+        row = i if record_timeline else 0
+        timeline[row, 0] = i + 1
+        timeline[row, 1] = page
+        timeline[row, 3] = NO_PAGE
+        if resident[page]:
+            hits += 1
+            timeline[row, 2] = 0
+            if page != newest:
+                if prev[page] >= 0:
+                    nxt[prev[page]] = nxt[page]
+                else:
+                    oldest = nxt[page]
+                prev[nxt[page]] = prev[page]
+                prev[page] = newest
+                nxt[page] = -1
+                nxt[newest] = page
+                newest = page
+            continue
+
+        timeline[row, 2] = 1
+        if count >= num_frames:
+            victim = oldest
+            oldest = nxt[victim]
+            if oldest >= 0:
+                prev[oldest] = -1
+            else:
+                newest = -1
+            resident[victim] = False
+            nxt[victim] = -1
+            count -= 1
+            timeline[row, 3] = victim
+
+        resident[page] = True
+        prev[page] = newest
+        nxt[page] = -1
+        if newest >= 0:
+            nxt[newest] = page
+        else:
+            oldest = page
+        newest = page
+        count += 1
+
+    return hits, n - hits, timeline[:n if record_timeline else 0], oldest, nxt
+
+
+@njit(cache=True)
+def next_use_kernel(ids, num_pages):
+    n = len(ids)
+    next_use = np.empty(n, dtype=np.int64)
+    last_seen = np.full(num_pages, n, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        next_use[i] = last_seen[ids[i]]
+        last_seen[ids[i]] = i
+    return next_use
+
+
+@njit(cache=True)
+def locality_walk_kernel(hot, offsets, jumps, max_page_num):
+    n = len(hot)
+    pages = np.empty(n, dtype=np.int32)
+    current = 0
+    for i in range(n):
+        if hot[i]:
+            current = min(max(current + offsets[i], 0), max_page_num)
+        else:
+            current = jumps[i]
+        pages[i] = current
+    return pages
+
+
+@njit(cache=True)
+def optimal_kernel(ids, num_frames, num_pages, next_use, record_timeline=True):
+    n = len(ids)
+    timeline = np.empty((n if record_timeline else 1, 4), dtype=np.int64)
+    slot_of = np.full(num_pages, -1, dtype=np.int64)
+    frame_page = np.empty(num_frames, dtype=np.int64)
+    # Priority of each resident page: its next use, or, once it is never used
+    # again, 2n minus its load step so the earliest loaded such page goes first.
+    frame_key = np.empty(num_frames, dtype=np.int64)
+    frame_loaded = np.empty(num_frames, dtype=np.int64)
+    filled = 0
+    hits = 0
+
+    for i in range(n):
+        page = ids[i]
+        row = i if record_timeline else 0
+        timeline[row, 0] = i + 1
+        timeline[row, 1] = page
+        timeline[row, 3] = NO_PAGE
+        slot = slot_of[page]
+        if slot >= 0:
+            hits += 1
+            timeline[row, 2] = 0
+        else:
+            timeline[row, 2] = 1
+            if filled < num_frames:
+                slot = filled
+                filled += 1
+            else:
+                slot = 0
+                for j in range(1, num_frames):
+                    if frame_key[j] > frame_key[slot]:
+                        slot = j
+                victim = frame_page[slot]
+                slot_of[victim] = -1
+                timeline[row, 3] = victim
+            frame_page[slot] = page
+            frame_loaded[slot] = i
+            slot_of[page] = slot
+
+        if next_use[i] < n:
+            frame_key[slot] = next_use[i]
+        else:
+            frame_key[slot] = 2 * n - frame_loaded[slot]
+
+    return hits, n - hits, timeline[:n if record_timeline else 0], frame_page, frame_loaded, filled
+
+
+@njit(cache=True)
+def mglru_kernel(ids, num_frames, num_pages, num_generations, aging_threshold,
+                 record_generations, record_timeline=True):
+    n = len(ids)
+    timeline = np.empty((n if record_timeline else 1, 4), dtype=np.int64)
+    generation_sizes = np.zeros((n if record_generations else 0, num_generations), dtype=np.int64)
+    gen_of = np.full(num_pages, -1, dtype=np.int64)
+    prev = np.full(num_pages, -1, dtype=np.int64)
+    nxt = np.full(num_pages, -1, dtype=np.int64)
+    head = np.full(num_generations, -1, dtype=np.int64)
+    tail = np.full(num_generations, -1, dtype=np.int64)
+    sizes = np.zeros(num_generations, dtype=np.int64)
+    count = 0
+    next_age_step = aging_threshold
+    hits = 0
+
+    for i in range(n):
+        page = ids[i]
+        row = i if record_timeline else 0
+        timeline[row, 0] = i + 1
+        timeline[row, 1] = page
+        timeline[row, 3] = NO_PAGE
+
+        if i + 1 >= next_age_step:
+            for g in range(num_generations - 2, -1, -1):
+                if sizes[g] > 0:
+                    aged = head[g]
+                    _unlink(aged, g, prev, nxt, head, tail, sizes)
+                    _link_tail(aged, g + 1, prev, nxt, head, tail, sizes)
+                    gen_of[aged] = g + 1
+                    break
+            next_age_step = i + 1 + aging_threshold
+
+        g = gen_of[page]
+        if g >= 0:
+            hits += 1
+            timeline[row, 2] = 0
+            if g != 0:
+                _unlink(page, g, prev, nxt, head, tail, sizes)
+                _link_tail(page, 0, prev, nxt, head, tail, sizes)
+                gen_of[page] = 0
+        else:
+            timeline[row, 2] = 1
+            if count == num_frames:
+                for g in range(num_generations - 1, -1, -1):
+                    if sizes[g] > 0:
+                        victim = head[g]
+                        _unlink(victim, g, prev, nxt, head, tail, sizes)
+                        gen_of[victim] = -1
+                        count -= 1
+                        timeline[row, 3] = victim
+                        break
+            _link_tail(page, 0, prev, nxt, head, tail, sizes)
+            gen_of[page] = 0
+            count += 1
+
+        if record_generations:
+            for g in range(num_generations):
+                generation_sizes[i, g] = sizes[g]
+
+    return hits, n - hits, timeline[:n if record_timeline else 0], generation_sizes, gen_of, head, nxt, next_age_step
+
+
+@njit(cache=True)
+def _unlink(page, g, prev, nxt, head, tail, sizes):
+    if prev[page] >= 0:
+        nxt[prev[page]] = nxt[page]
+    else:
+        head[g] = nxt[page]
+    if nxt[page] >= 0:
+        prev[nxt[page]] = prev[page]
+    else:
+        tail[g] = prev[page]
+    prev[page] = -1
+    nxt[page] = -1
+    sizes[g] -= 1
+
+
+@njit(cache=True)
+def _link_tail(page, g, prev, nxt, head, tail, sizes):
+    prev[page] = tail[g]
+    nxt[page] = -1
+    if tail[g] >= 0:
+        nxt[tail[g]] = page
+    else:
+        head[g] = page
+    tail[g] = page
+    sizes[g] += 1
+
+
+def to_process_page_ids(pids, pages, num_processes):
+    # Dense ids for (pid, page) pairs, so the fixed-allocation kernels can keep
+    # one flat per-page array shared by all processes.
+    uniques, page_ids = to_page_ids(pages)
+    num_pages = len(uniques)
+    keys = (np.asarray(pids, dtype=np.int64) - 1) * num_pages + page_ids
+    if num_processes * num_pages <= max(len(keys), DENSE_PAGE_LIMIT):
+        return keys, num_processes * num_pages
+    pair_keys, ids = np.unique(keys, return_inverse=True)
+    return ids.astype(np.int64), len(pair_keys)
+
+
+# Stats-only kernels for fixed allocation. ids come from to_process_page_ids,
+# so a page id already belongs to exactly one process; every process keeps its
+# own FIFO ring or LRU list, indexed by pid - 1, over those ids.
+@njit(cache=True)
+def fifo_fixed_kernel(pids, ids, num_processes, frames_per_process, num_keys):
+    resident = np.zeros(num_keys, dtype=np.bool_)
+    ring = np.empty((num_processes, frames_per_process), dtype=np.int64)
+    filled = np.zeros(num_processes, dtype=np.int64)
+    head = np.zeros(num_processes, dtype=np.int64)
+    hits = np.zeros(num_processes, dtype=np.int64)
+    faults = np.zeros(num_processes, dtype=np.int64)
+
+    for i in range(len(pids)):
+        p = pids[i] - 1
+        page = ids[i]
+        if resident[page]:
+            hits[p] += 1
+            continue
+
+        faults[p] += 1
+        if filled[p] < frames_per_process:
+            ring[p, filled[p]] = page
+            filled[p] += 1
+        else:
+            resident[ring[p, head[p]]] = False
+            ring[p, head[p]] = page
+            head[p] = (head[p] + 1) % frames_per_process
+        resident[page] = True
+
+    return hits, faults
+
+
+@njit(cache=True)
+def lru_fixed_kernel(pids, ids, num_processes, frames_per_process, num_keys):
+    resident = np.zeros(num_keys, dtype=np.bool_)
+    prev = np.full(num_keys, -1, dtype=np.int64)
+    nxt = np.full(num_keys, -1, dtype=np.int64)
+    oldest = np.full(num_processes, -1, dtype=np.int64)
+    newest = np.full(num_processes, -1, dtype=np.int64)
+    count = np.zeros(num_processes, dtype=np.int64)
+    hits = np.zeros(num_processes, dtype=np.int64)
+    faults = np.zeros(num_processes, dtype=np.int64)
+
+    for i in range(len(pids)):
+        p = pids[i] - 1
+        page = ids[i]
+        if resident[page]:
+            hits[p] += 1
+            if page != newest[p]:
+                _unlink(page, p, prev, nxt, oldest, newest, count)
+                _link_tail(page, p, prev, nxt, oldest, newest, count)
+            continue
+
+        faults[p] += 1
+        if count[p] == frames_per_process:
+            victim = oldest[p]
+            _unlink(victim, p, prev, nxt, oldest, newest, count)
+            resident[victim] = False
+        _link_tail(page, p, prev, nxt, oldest, newest, count)
+        resident[page] = True
+
+    return hits, faults
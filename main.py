@@ -1,4 +1,7 @@
 import argparse
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import algorithms
 import workload
 import simulation
@@ -14,7 +17,6 @@ def run_single_simulation(args):
         page_requests = workload.parse_workload(args.workload_file)
     else:
         w_type, w_len, w_max = args.generate_workload
-        w_len, w_max = int(w_len), int(w_max)
         print(f"Generating workload: {w_type}, Length={w_len}, Max Page={w_max}")
         page_requests = workload.generate_workload(w_len, w_max, w_type)
 
@@ -22,10 +24,9 @@ def run_single_simulation(args):
         print("Error: No workload to process. Exiting.")
         return
 
-    algo_instance = get_algorithm_instance(args.alg, args.frames)
-    if not algo_instance:
-        print(f"Error: Algorithm '{args.alg}' is not implemented.")
-        return
+    algo_instance = get_algorithm_instance(args.alg, args.frames, expected_requests=len(page_requests))
+    if isinstance(algo_instance, algorithms.MGLRU):
+        algo_instance.record_generations = True
 
     print(f"--- Running Single-Process Simulation ---")
     print(f"Algorithm: {args.alg}")
@@ -56,7 +57,6 @@ def run_comparison_simulation(args):
         page_requests = workload.parse_workload(args.workload_file)
     else:
         w_type, w_len, w_max = args.generate_workload
-        w_len, w_max = int(w_len), int(w_max)
         print(f"Generating workload: {w_type}, Length={w_len}, Max Page={w_max}")
         page_requests = workload.generate_workload(w_len, w_max, w_type)
 
@@ -64,47 +64,57 @@ def run_comparison_simulation(args):
         print("Error: No workload to process. Exiting.")
         return
     
-    alg_list = ['FIFO', 'LRU', 'Optimal', 'MGLRU']
+    alg_list = list(_ALG_TABLE)
     min_frames, max_frames = args.compare
     frame_range = range(min_frames, max_frames + 1)
-    results_data = []
     
     print(f"--- Running Comparison Simulation ---")
     print(f"Workload Length: {len(page_requests)}")
     print(f"Algorithms: {', '.join(alg_list)}")
     print(f"Frame Range: {min_frames} to {max_frames}")
     
+    # Jobs are collected in submission order, so the CSV always lists rows by
+    # (algorithm, frames); each row is written as soon as it and every row
+    # before it are done, and kept only as one (frames, miss ratio) point per
+    # algorithm for the plot.
+    miss_ratios = {alg_name: (array('d'), array('d')) for alg_name in alg_list}
+    csv_file, csv_writer = reporting.open_csv_report()
     total_sims = len(alg_list) * len(frame_range)
-    with tqdm(total=total_sims, desc="Running Simulations") as pbar:
+    with csv_file, \
+            ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                initializer=simulation.init_comparison_worker,
+                                initargs=(page_requests,)) as executor, \
+            tqdm(total=total_sims, desc="Running Simulations") as pbar:
+        futures = {}
         for alg_name in alg_list:
+            alg_class = _ALG_TABLE[alg_name]
             for num_frames in frame_range:
-                try:
-                    algo_instance = get_algorithm_instance(alg_name, num_frames)
-                    stats = simulation.run_single_process(algo_instance, page_requests, num_frames)
-                    stats['Algorithm'] = alg_name
-                    stats['Frames'] = num_frames
-                    results_data.append(stats)
-                except Exception as e:
-                    print(f"\n[!] Error during simulation: {alg_name} @ {num_frames} frames. Error: {e}")
-                
-                pbar.update(1)
+                job = executor.submit(simulation.run_comparison_job, alg_class, num_frames)
+                futures[job] = (alg_name, num_frames)
+
+        for job in futures:
+            alg_name, num_frames = futures[job]
+            try:
+                stats = job.result()
+                stats['Algorithm'] = alg_name
+                stats['Frames'] = num_frames
+                reporting.write_csv_row(csv_writer, stats)
+                frames, ratios = miss_ratios[alg_name]
+                frames.append(num_frames)
+                ratios.append(stats['Miss Ratio (raw)'])
+            except Exception as e:
+                print(f"\n[!] Error during simulation: {alg_name} @ {num_frames} frames. Error: {e}")
+            
+            pbar.update(1)
 
     print("\nSimulations complete. Generating outputs...")
-    reporting.plot_comparison_graph(results_data)
-    reporting.save_csv_report(results_data)
+    reporting.plot_comparison_series(miss_ratios)
+    print(f"[+] Success! CSV report saved to: {csv_file.name}")
 
 
 def run_multi_process_simulation(args):
     
-    try:
-        alloc_strategy = args.multi[0]
-        alg_name = args.multi[1]
-        total_frames = int(args.multi[2])
-        num_processes = int(args.multi[3])
-    except Exception:
-        print("Error: Invalid arguments for --multi mode.")
-        print("Expected: --multi <fixed|global> <ALG> <FRAMES> <NUM_PROCS>")
-        return
+    alloc_strategy, alg_name, total_frames, num_processes = args.multi
 
     if args.workload_file:
         print("Error: --multi mode requires a *generated* workload.")
@@ -114,19 +124,8 @@ def run_multi_process_simulation(args):
         print("Error: --multi mode requires --generate_multiprocess.")
         return
 
-    try:
-        w_type = args.generate_multiprocess[0]
-        w_len = int(args.generate_multiprocess[1])
-        w_max_per_proc = int(args.generate_multiprocess[2])
-    except Exception:
-        print("Error: Invalid arguments for --generate_multiprocess.")
-        print("Expected: --generate_multiprocess <TYPE> <LENGTH> <MAX_PAGE_PER_PROC>")
-        return
-
+    w_type, w_len, w_max_per_proc = args.generate_multiprocess
     alg_class = get_algorithm_class(alg_name)
-    if not alg_class:
-        print(f"Error: Algorithm '{alg_name}' not found.")
-        return
         
     print(f"Generating multi-process workload...")
     mp_workload = workload.generate_multiprocess_workload(w_len, num_processes, w_max_per_proc, w_type)
@@ -139,37 +138,32 @@ def run_multi_process_simulation(args):
     print(f"Workload: {w_type}, Length={w_len}")
     print("----------------------------------------")
 
-    stats = {}
     if alloc_strategy == 'fixed':
-        stats = multi_sim.run_fixed_allocation_sim(alg_class, mp_workload, total_frames, num_processes)
-    elif alloc_strategy == 'global':
-        stats = multi_sim.run_global_allocation_sim(alg_class, mp_workload, total_frames)
+        stats = multi_sim.run_fixed_allocation_sim(alg_class, mp_workload, total_frames, num_processes,
+                                                   max_workers=os.cpu_count())
     else:
-        print(f"Error: Unknown allocation strategy '{alloc_strategy}'.")
-        return
+        stats = multi_sim.run_global_allocation_sim(alg_class, mp_workload, total_frames)
 
     print("\n--- Multi-Process Results ---")
     print_stats(stats)
 
 
+_ALG_TABLE = {
+    'FIFO': algorithms.FIFO,
+    'LRU': algorithms.LRU,
+    'Optimal': algorithms.Optimal,
+    'MGLRU': algorithms.MGLRU,
+}
+
 def get_algorithm_class(alg_name):
    
-    if alg_name == 'FIFO':
-        return algorithms.FIFO
-    elif alg_name == 'LRU':
-        return algorithms.LRU
-    elif alg_name == 'Optimal':
-        return algorithms.Optimal
-    elif alg_name == 'MGLRU':
-        return algorithms.MGLRU
-    else:
-        return None
+    return _ALG_TABLE.get(alg_name)
 
-def get_algorithm_instance(alg_name, num_frames):
+def get_algorithm_instance(alg_name, num_frames, **options):
    
     alg_class = get_algorithm_class(alg_name)
     if alg_class:
-        return alg_class(num_frames)
+        return alg_class(num_frames, **options)
     return None
 
 def print_stats(stats):
@@ -177,8 +171,36 @@ def print_stats(stats):
     print(f"Total Requests: {stats.get('Total Requests', 'N/A')}")
     print(f"Page Hits: {stats.get('Page Hits', 'N/A')}")
     print(f"Page Faults: {stats.get('Page Faults', 'N/A')}")
-    print(f"Hit Ratio: {stats.get('Hit Ratio', 'N/A')}")
-    print(f"Miss Ratio: {stats.get('Miss Ratio', 'N/A')}")
+    print(f"Hit Ratio: {stats['Hit Ratio (raw)']:.2%}")
+    print(f"Miss Ratio: {stats['Miss Ratio (raw)']:.2%}")
+
+
+def _choice(*options):
+    
+    def convert(value):
+        if value not in options:
+            raise ValueError(f"invalid choice: '{value}' (choose from {', '.join(options)})")
+        return value
+    return convert
+
+def positive_int(value):
+    
+    number = int(value)
+    if number <= 0:
+        raise ValueError(f"must be a positive integer, got {value}")
+    return number
+
+def _typed_values(*converters):
+    # argparse applies type= and choices= to every value of a multi-value
+    # option alike, so options mixing names and numbers convert per position.
+    class TypedValues(argparse.Action):
+        def __call__(self, parser, namespace, values, option_string=None):
+            try:
+                values = [convert(value) for convert, value in zip(converters, values)]
+            except ValueError as e:
+                parser.error(f"argument {option_string}: {e}")
+            setattr(namespace, self.dest, values)
+    return TypedValues
 
 
 def main():
@@ -188,28 +210,32 @@ def main():
     workload_group.add_argument('--workload_file', type=str,
                                 help='(Single-Process) Path to a workload trace file.')
     workload_group.add_argument('--generate_workload', nargs=3,
+                                action=_typed_values(_choice(*workload.WORKLOAD_TYPES), int, int),
                                 metavar=('TYPE', 'LEN', 'MAX_P'),
                                 help="(Single-Process) Generate a workload.")
     workload_group.add_argument('--generate_multiprocess', nargs=3,
+                                action=_typed_values(_choice(*workload.WORKLOAD_TYPES), int, int),
                                 metavar=('TYPE', 'LEN', 'MAX_P_PER_PROC'),
                                 help="(Multi-Process) Generate a multi-process workload.")
 
     mode_group = parser.add_mutually_exclusive_group(required=True)
     mode_group.add_argument('--single', nargs=2,
+                            action=_typed_values(_choice(*_ALG_TABLE), positive_int),
                             metavar=('ALG', 'FRAMES'),
                             help="Run a single-process simulation.")
-    mode_group.add_argument('--compare', nargs=2, type=int,
+    mode_group.add_argument('--compare', nargs=2, type=positive_int,
                             metavar=('MIN_F', 'MAX_F'),
                             help="Run a single-process comparison plot.")
     mode_group.add_argument('--multi', nargs=4,
+                            action=_typed_values(_choice('fixed', 'global'), _choice(*_ALG_TABLE),
+                                                  positive_int, positive_int),
                             metavar=('ALLOC', 'ALG', 'FRAMES', 'NUM_PROCS'),
                             help="Run a multi-process simulation (e.g., 'fixed FIFO 128 4')")
 
     args = parser.parse_args()
 
     if args.single:
-        args.alg = args.single[0]
-        args.frames = int(args.single[1])
+        args.alg, args.frames = args.single
         run_single_simulation(args)
         
     elif args.compare:
@@ -1,30 +1,55 @@
-import pandas as pd
+import numpy as np
+
+# One row per request. evicted and loaded are NO_PAGE on a hit, and evicted
+# is NO_PAGE on a fault that filled a free frame.
+EVENT_DTYPE = np.dtype([('step', 'i8'), ('page', 'i8'), ('is_fault', '?'),
+                        ('evicted', 'i8'), ('loaded', 'i8')])
+NO_PAGE = -1
 
 class MetricsCollector:
-    
-    def __init__(self):
+    __slots__ = ('hits', 'faults', 'total_requests', 'initial_frames', 'promotes_on_hit', 'events')
+
+    def __init__(self, initial_frames=(), promotes_on_hit=False, capacity=1024):
         self.hits = 0
         self.faults = 0
         self.total_requests = 0
-        
 
-        self.timeline = []
+        self.initial_frames = list(initial_frames)
+        self.promotes_on_hit = promotes_on_hit
+        self.events = np.zeros(max(capacity, 1), dtype=EVENT_DTYPE)
 
-    def record_hit(self, step, page, frames):
-        self.hits += 1
+    def _record(self, step, page, is_fault, evicted, loaded):
+        n = self.total_requests
+        if n == len(self.events):
+            grown = np.zeros(2 * n, dtype=EVENT_DTYPE)
+            grown[:n] = self.events
+            self.events = grown
+        self.events[n] = (step, page, is_fault,
+                          NO_PAGE if evicted is None else evicted,
+                          NO_PAGE if loaded is None else loaded)
         self.total_requests += 1
-        self.timeline.append((step, page, False, list(frames)))
 
-    def record_fault(self, step, page, frames):
+    def record_hit(self, step, page):
+        self.hits += 1
+        self._record(step, page, False, None, None)
+
+    def record_fault(self, step, page, evicted=None, loaded=None):
         self.faults += 1
-        self.total_requests += 1
-        self.timeline.append((step, page, True, list(frames)))
+        self._record(step, page, True, evicted, page if loaded is None else loaded)
+
+    @property
+    def timeline(self):
+        return self.events[:self.total_requests]
+
+    def get_timeline_ndarray(self):
+
+        return self.timeline
 
     def get_stats(self):
-        
+
         hit_ratio = (self.hits / self.total_requests) if self.total_requests > 0 else 0
         miss_ratio = (self.faults / self.total_requests) if self.total_requests > 0 else 0
-        
+
         return {
             "Total Requests": self.total_requests,
             "Page Faults": self.faults,
@@ -33,9 +58,31 @@ class MetricsCollector:
             "Miss Ratio": miss_ratio
         }
 
-    def get_timeline_dataframe(self):
+    def _frame_states(self):
+
+        frames = list(self.initial_frames)
+        timeline = self.timeline
+        for page, evicted, loaded in zip(timeline['page'].tolist(), timeline['evicted'].tolist(),
+                                         timeline['loaded'].tolist()):
+            if evicted != NO_PAGE:
+                frames.remove(evicted)
+            if loaded != NO_PAGE:
+                frames.append(loaded)
+            elif self.promotes_on_hit:
+                frames.remove(page)
+                frames.append(page)
+            yield list(frames)
+
+    def get_timeline_dataframe(self, include_frames=True):
+        # pandas is only needed here, so it is not imported with the module.
+        import pandas as pd
 
-        return pd.DataFrame(
-            self.timeline,
-            columns=["Step", "Page", "Is Fault", "Frames State"]
-        )
\ No newline at end of file
+        timeline = self.timeline
+        df = pd.DataFrame({
+            "Step": timeline['step'],
+            "Page": timeline['page'],
+            "Is Fault": timeline['is_fault'],
+        })
+        if include_frames:
+            df["Frames State"] = list(self._frame_states())
+        return df
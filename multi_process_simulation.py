@@ -1,31 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 import algorithms
-import math
-from collections import defaultdict
+import algorithms_jit
+import workload as workload_gen
+
+# Algorithms whose fixed-allocation runs only need hit and fault counts can
+# skip the per-process objects and run every process in one compiled pass.
+_FIXED_KERNELS = {
+    algorithms.FIFO: algorithms_jit.fifo_fixed_kernel,
+    algorithms.LRU: algorithms_jit.lru_fixed_kernel,
+}
 
 def run_global_allocation_sim(alg_class, workload, total_frames):
     
-    
+    pids, pages = workload
    
     global_sim = alg_class(total_frames)
-    
- 
-    for i, (pid, page_num) in enumerate(workload):
-     
-        page_to_request = (pid, page_num)
-        
-        future_workload = []
-        
-      
-        if isinstance(global_sim, algorithms.Optimal):
-            future_workload = workload[i+1:]
-        
-        global_sim.process_page_request(page_to_request, workload_future=future_workload)
-        
+    global_sim.run_workload(workload_gen.global_page_keys(pids, pages).tolist(), record_timeline=False)
  
-    return global_sim.get_stats()
+    return global_sim.get_stats_raw()
+
+
+def preprocess_workload(workload, num_processes):
+    # Splits the trace into one SimContext per process. None of this depends
+    # on the frame count, so a sweep over frame counts can build it once and
+    # pass it to every run_fixed_allocation_sim call.
+    pids, pages = workload
+    order = np.argsort(pids, kind='stable')
+    bounds = np.searchsorted(pids[order], np.arange(1, num_processes + 1), side='right')
+    return [algorithms.SimContext(trace.tolist()) for trace in np.split(pages[order], bounds[:-1])]
 
 
-def run_fixed_allocation_sim(alg_class, workload, total_frames, num_processes):
+def _run_process_job(alg_class, frames_per_process, context):
+    
+    sim = alg_class(frames_per_process)
+    sim.run_workload(context.pages, context, record_timeline=False)
+    return sim.raw_stats()
+
+
+def run_fixed_allocation_sim(alg_class, workload, total_frames, num_processes, process_contexts=None,
+                             max_workers=None):
     
     
     if total_frames < num_processes:
@@ -34,59 +50,62 @@ def run_fixed_allocation_sim(alg_class, workload, total_frames, num_processes):
         frames_per_process = 1
     else:
    
-        frames_per_process = math.floor(total_frames / num_processes)
+        frames_per_process = total_frames // num_processes
 
 
-    simulators = {}
-    for pid in range(1, num_processes + 1):
-        simulators[pid] = alg_class(frames_per_process)
+    pids, pages = np.asarray(workload[0]), np.asarray(workload[1])
+    workload = pids, pages
+    # Both paths index per-process state by pid - 1, so a pid outside
+    # 1..num_processes would silently land in the wrong process.
+    if len(pids) and (pids.min() < 1 or pids.max() > num_processes):
+        raise ValueError(f"Process ids must be between 1 and {num_processes}, "
+                         f"got {pids.min()} to {pids.max()}.")
+    total_stats = {
+        "Total Requests": len(pids),
+        "Page Faults": 0,
+        "Page Hits": 0,
+    }
 
+    fixed_kernel = _FIXED_KERNELS.get(alg_class) if algorithms_jit.NUMBA_AVAILABLE else None
+    if fixed_kernel is not None:
+        ids, num_keys = algorithms_jit.to_process_page_ids(pids, pages, num_processes)
+        hits, faults = fixed_kernel(pids, ids, num_processes, frames_per_process, num_keys)
+        total_stats["Page Faults"] = int(faults.sum())
+        total_stats["Page Hits"] = int(hits.sum())
+        return _with_ratios(total_stats)
 
-    process_workloads = defaultdict(list)
-    for pid, page_num in workload:
-        process_workloads[pid].append(page_num)
+    # PIDs run from 1 to num_processes, so per-process contexts live in a
+    # list indexed by pid - 1.
+    if process_contexts is None:
+        process_contexts = preprocess_workload(workload, num_processes)
 
-    
-    process_workloads_future = defaultdict(lambda: defaultdict(list))
-    if alg_class == algorithms.Optimal:
-        for pid, trace in process_workloads.items():
-            for i in range(len(trace)):
-                process_workloads_future[pid][i] = trace[i+1:]
+    # Processes never share frames under fixed allocation, so each one's
+    # requests can be replayed on its own, and in its own worker process
+    # when max_workers allows it.
+    max_workers = min(max_workers or 1, len(process_contexts))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            raw_stats = list(executor.map(_run_process_job, [alg_class] * len(process_contexts),
+                                          [frames_per_process] * len(process_contexts), process_contexts))
+    else:
+        raw_stats = [_run_process_job(alg_class, frames_per_process, context) for context in process_contexts]
 
-   
-    
-    
-    process_step = defaultdict(int) 
-    
-    for pid, page_num in workload:
-        sim = simulators[pid]
-        
-        future = []
-        if isinstance(sim, algorithms.Optimal):
-            step = process_step[pid]
-            future = process_workloads_future[pid][step]
-            
-        sim.process_page_request(page_num, workload_future=future)
-        process_step[pid] += 1
+    counters = np.fromiter((value for stats in raw_stats for value in stats),
+                           dtype=np.int64, count=3 * len(raw_stats)).reshape(-1, 3)
+    faults, hits, _ = counters.sum(axis=0).tolist()
+    total_stats["Page Faults"] = faults
+    total_stats["Page Hits"] = hits
+
+    return _with_ratios(total_stats)
 
-   
-    total_stats = {
-        "Total Requests": 0,
-        "Page Faults": 0,
-        "Page Hits": 0,
-    }
-    
-    for pid, sim in simulators.items():
-        stats = sim.get_stats() 
-        total_stats["Total Requests"] += stats["Total Requests"]
-        total_stats["Page Faults"] += stats["Page Faults"]
-        total_stats["Page Hits"] += stats["Page Hits"]
 
+def _with_ratios(total_stats):
+    
    
     hit_ratio = (total_stats["Page Hits"] / total_stats["Total Requests"]) if total_stats["Total Requests"] > 0 else 0
     miss_ratio = (total_stats["Page Faults"] / total_stats["Total Requests"]) if total_stats["Total Requests"] > 0 else 0
     
-    total_stats["Hit Ratio"] = f"{hit_ratio:.2%}"
-    total_stats["Miss Ratio"] = f"{miss_ratio:.2%}"
+    total_stats["Hit Ratio (raw)"] = hit_ratio
+    total_stats["Miss Ratio (raw)"] = miss_ratio
     
     return total_stats
\ No newline at end of file
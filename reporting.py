@@ -1,268 +1,211 @@
+import csv
+import matplotlib
+# Reports are only ever written to files, so skip GUI backend setup.
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter
+import numpy as np
 import pandas as pd
 import os
 
-def plot_comparison_graph(results_data, output_filename="comparison_plot.png"):
-    
+RESULTS_DIR = "results"
+# Raster resolution for saved figures, pinned so a local matplotlibrc
+# cannot blow up render time on dense plots.
+PLOT_DPI = 100
+# Above this many requests the timeline is drawn as a fault-rate density
+# plot instead of one marker per request.
+TIMELINE_HEXBIN_THRESHOLD = 200_000
+
+def _results_path(output_filename):
     
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    return os.path.join(RESULTS_DIR, output_filename)
+
+def _reset_axes(ax, figsize):
+    # Callers drawing several plots in a row can pass one Axes and have it
+    # cleared and redrawn instead of paying for a new Figure each time.
+    if ax is None:
+        _, ax = plt.subplots(figsize=figsize)
+    else:
+        ax.clear()
+    return ax
+
+
+def plot_comparison_series(series, output_filename="comparison_plot.png", ax=None):
+    # series maps each algorithm name to (frames, miss_ratios); the points
+    # need not be sorted by frame count.
     
-    filepath = os.path.join(output_path, output_filename)
+    filepath = _results_path(output_filename)
     
-    if not results_data:
+    series = {alg_name: (np.asarray(frames), np.asarray(miss_ratios))
+              for alg_name, (frames, miss_ratios) in series.items() if len(frames)}
+    if not series:
         print("Reporting Error: No results data to plot.")
         return
 
-    df = pd.DataFrame(results_data)
+    owns_figure = ax is None
+    ax = _reset_axes(ax, (12, 8))
     
-    if df.empty:
-        print("Reporting Error: DataFrame is empty, cannot plot.")
-        return
-
-    plt.figure(figsize=(12, 8))
-    
-    for alg_name in df['Algorithm'].unique():
-        alg_df = df[df['Algorithm'] == alg_name]
-        
-        plt.plot(alg_df['Frames'], alg_df['Miss Ratio (raw)'], marker='o', linestyle='-', label=alg_name)
+    for alg_name, (frames, miss_ratios) in series.items():
+        order = np.argsort(frames, kind='stable')
+        ax.plot(frames[order], miss_ratios[order], marker='o', linestyle='-', label=alg_name)
         
 
-    plt.title('Page Replacement Algorithm Comparison', fontsize=16)
-    plt.xlabel('Number of Frames', fontsize=12)
-    plt.ylabel('Miss Ratio', fontsize=12)
-    plt.legend(fontsize=10)
-    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax.set_title('Page Replacement Algorithm Comparison', fontsize=16)
+    ax.set_xlabel('Number of Frames', fontsize=12)
+    ax.set_ylabel('Miss Ratio', fontsize=12)
+    ax.legend(fontsize=10)
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
     
-    frame_ticks = df['Frames'].unique()
+    frame_ticks = np.unique(np.concatenate([frames for frames, _ in series.values()]))
     if len(frame_ticks) > 20:
          step = 2 if len(frame_ticks) < 50 else 5
-         plt.xticks(frame_ticks[::step])
+         ax.set_xticks(frame_ticks[::step])
     else:
-         plt.xticks(frame_ticks)
+         ax.set_xticks(frame_ticks)
          
-    plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{y:.0%}'))
-    plt.ylim(0, 1)
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f'{y:.0%}'))
+    ax.set_ylim(0, 1)
     
     try:
-        plt.savefig(filepath)
+        ax.figure.savefig(filepath, dpi=PLOT_DPI)
         print(f"\n[+] Success! Comparison graph saved to: {filepath}")
     except Exception as e:
         print(f"\n[-] Error saving plot: {e}")
+    if owns_figure:
+        plt.close(ax.figure)
 
 
-def save_csv_report(results_data, output_filename="comparison_results.csv"):
-    
-    
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    
-    filepath = os.path.join(output_path, output_filename)
-    
-    if not results_data:
-        print("Reporting Error: No results data to save to CSV.")
-        return
+CSV_REPORT_COLUMNS = ['Algorithm', 'Frames', 'Page Faults', 'Page Hits', 'Total Requests', 'Miss Ratio', 'Hit Ratio']
 
-    df = pd.DataFrame(results_data)
+def open_csv_report(output_filename="comparison_results.csv"):
     
-
-    if 'Hit Ratio (raw)' in df.columns:
-        df = df.drop(columns=['Hit Ratio (raw)'])
-    if 'Miss Ratio (raw)' in df.columns:
-        df = df.drop(columns=['Miss Ratio (raw)'])
-        
-    cols = ['Algorithm', 'Frames', 'Page Faults', 'Page Hits', 'Total Requests', 'Miss Ratio', 'Hit Ratio']
-    final_cols = [c for c in cols if c in df.columns]
-    df = df[final_cols]
     
-    try:
-        df.to_csv(filepath, index=False)
-        print(f"[+] Success! CSV report saved to: {filepath}")
-    except Exception as e:
-        print(f"\n[-] Error saving CSV report: {e}")
-
-
+    filepath = _results_path(output_filename)
+    csv_file = open(filepath, 'w', newline='')
+    writer = csv.DictWriter(csv_file, fieldnames=CSV_REPORT_COLUMNS, extrasaction='ignore',
+                            lineterminator='\n')
+    writer.writeheader()
+    return csv_file, writer
 
-def plot_timeline_events(timeline, output_filename="timeline_plot.png"):
-    
-    
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    
-    filepath = os.path.join(output_path, output_filename)
-    
-    if not timeline:
-        print("Reporting Error: No timeline data to plot.")
-        return
 
-    hits = []    
-    faults = []  
+def write_csv_row(writer, stats):
     
-    for entry in timeline:
-        step, page, event = entry[0], entry[1], entry[2]
-        if event == "Hit":
-            hits.append((step, page))
-        else: 
-            faults.append((step, page))
-
-
-    hits_x = [h[0] for h in hits] if hits else [0]
-    hits_y = [h[1] for h in hits] if hits else [0]
-    faults_x = [f[0] for f in faults] if faults else [0]
-    faults_y = [f[1] for f in faults] if faults else [0]
+    row = dict(stats)
+    for ratio in ('Hit Ratio', 'Miss Ratio'):
+        if f'{ratio} (raw)' in row:
+            row[ratio] = f"{row[f'{ratio} (raw)']:.2%}"
+    writer.writerow(row)
 
-    plt.figure(figsize=(15, 8)) 
-    
-    if faults:
-        plt.scatter(faults_x, faults_y, color='red', marker='x', s=50, label='Page Fault')
-    if hits:
-        plt.scatter(hits_x, hits_y, color='green', marker='o', s=10, alpha=0.7, label='Page Hit')
 
-    plt.title('Timeline of Page Hits and Faults', fontsize=16)
-    plt.xlabel('Simulation Step', fontsize=12)
-    plt.ylabel('Page Number', fontsize=12)
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.5)
-    
-    plt.xlim(0, max(hits_x + faults_x) + 1)
-    all_pages = hits_y + faults_y
-    plt.ylim(min(all_pages) - 1, max(all_pages) + 1)
-    
-    try:
-        plt.savefig(filepath)
-        print(f"[+] Success! Timeline plot saved to: {filepath}")
-    except Exception as e:
-        print(f"\n[-] Error saving timeline plot: {e}")
+def _timeline_row(entry):
+    # Hit entries have no evicted page, so they are one field shorter.
+    step, page, event, frames = entry[:4]
+    evicted = entry[4] if len(entry) == 5 else None
+    evicted = "---" if evicted is None else str(evicted)
+    return f"{step:<5} | {page:<5} | {event:<5} | {evicted:<7} | {', '.join(map(str, frames))}\n"
 
 def save_timeline_report(timeline, output_filename="timeline_report.txt"):
    
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    
-    filepath = os.path.join(output_path, output_filename)
+    filepath = _results_path(output_filename)
     
     try:
-        with open(filepath, 'w') as f:
+        rows = [_timeline_row(entry) for entry in timeline]
+        with open(filepath, 'w', buffering=1 << 20) as f:
             f.write("--- Page Replacement Timeline ---\n\n")
             f.write(f"{'Step':<5} | {'Page':<5} | {'Event':<5} | {'Evicted':<7} | Frames State\n")
             f.write("-" * 60 + "\n")
-            
-            for entry in timeline:
-                if len(entry) == 4: 
-                    step, page, event, frames = entry
-                    evicted = "---"
-                else: 
-                    step, page, event, frames, evicted_page = entry
-                    evicted = str(evicted_page) if evicted_page is not None else "---"
-                
-               
-                if frames and isinstance(frames[0], tuple):
-                    frames_str = ", ".join(map(str, frames))
-                else:
-                    frames_str = ", ".join(map(str, frames))
-
-                f.write(f"{step:<5} | {page:<5} | {event:<5} | {evicted:<7} | {frames_str}\n")
+            f.writelines(rows)
         
         print(f"[+] Success! Timeline report saved to: {filepath}")
     except Exception as e:
         print(f"\n[-] Error saving timeline report: {e}")
 
 
-def plot_timeline_events(timeline, output_filename="timeline_plot.png"):
+def plot_timeline_events(timeline, output_filename="timeline_plot.png", ax=None):
    
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    
-    filepath = os.path.join(output_path, output_filename)
+    filepath = _results_path(output_filename)
     
     if not timeline:
         print("Reporting Error: No timeline data to plot.")
         return
 
-    hits = []    
-    faults = []  
-    
-    for entry in timeline:
-        step, page, event = entry[0], entry[1], entry[2]
-        if event == "Hit":
-            hits.append((step, page))
-        else: 
-            faults.append((step, page))
-
- 
-    hits_x = [h[0] for h in hits] if hits else []
-    hits_y = [h[1] for h in hits] if hits else []
-    faults_x = [f[0] for f in faults] if faults else []
-    faults_y = [f[1] for f in faults] if faults else []
+    count = len(timeline)
+    steps = np.fromiter((entry[0] for entry in timeline), dtype=np.int64, count=count)
+    pages = np.fromiter((entry[1] for entry in timeline), dtype=np.int64, count=count)
+    fault_mask = np.fromiter((entry[2] != "Hit" for entry in timeline), dtype=bool, count=count)
 
-    if not hits_x and not faults_x:
-        print("No hits or faults to plot.")
-        return
-    
-    plt.figure(figsize=(15, 8)) 
-    
-    if faults:
-        plt.scatter(faults_x, faults_y, color='red', marker='x', s=50, label='Page Fault')
-    if hits:
-        plt.scatter(hits_x, hits_y, color='green', marker='o', s=10, alpha=0.7, label='Page Hit')
-
-    plt.title('Timeline of Page Hits and Faults', fontsize=16)
-    plt.xlabel('Simulation Step', fontsize=12)
-    plt.ylabel('Page Number', fontsize=12)
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.5)
+    owns_figure = ax is None
+    ax = _reset_axes(ax, (15, 8))
     
-    all_steps = hits_x + faults_x
-    all_pages = hits_y + faults_y
-    plt.xlim(0, max(all_steps) + 1 if all_steps else 1)
-    plt.ylim(min(all_pages) - 1 if all_pages else 0, max(all_pages) + 1 if all_pages else 1)
+    if count > TIMELINE_HEXBIN_THRESHOLD:
+        cells = ax.hexbin(steps, pages, C=fault_mask, reduce_C_function=np.mean, gridsize=200,
+                          cmap='RdYlGn_r', vmin=0, vmax=1, rasterized=True)
+        ax.figure.colorbar(cells, ax=ax, label='Fault Ratio')
+    else:
+        # Dense point clouds go through the raster backend instead of being
+        # drawn as one vector path per marker.
+        if not fault_mask.all():
+            ax.scatter(steps[~fault_mask], pages[~fault_mask], color='green', marker='.', s=4, alpha=0.5,
+                       rasterized=True, label='Page Hit')
+        if fault_mask.any():
+            ax.scatter(steps[fault_mask], pages[fault_mask], color='red', marker='x', s=20,
+                       rasterized=True, label='Page Fault')
+        ax.legend()
+
+    ax.set_title('Timeline of Page Hits and Faults', fontsize=16)
+    ax.set_xlabel('Simulation Step', fontsize=12)
+    ax.set_ylabel('Page Number', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    
+    ax.set_xlim(0, steps.max() + 1)
+    ax.set_ylim(pages.min() - 1, pages.max() + 1)
     
     try:
-        plt.savefig(filepath)
+        ax.figure.savefig(filepath, dpi=PLOT_DPI)
         print(f"[+] Success! Timeline plot saved to: {filepath}")
     except Exception as e:
         print(f"\n[-] Error saving timeline plot: {e}")
+    if owns_figure:
+        plt.close(ax.figure)
 
-def plot_mglru_generations(generation_log, num_generations, output_filename="mglru_generations_plot.png"):
-    
-    output_path = "results"
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
+def plot_mglru_generations(generation_log, num_generations, output_filename="mglru_generations_plot.png",
+                           ax=None):
     
-    filepath = os.path.join(output_path, output_filename)
+    filepath = _results_path(output_filename)
     
     if not generation_log:
         print("Reporting Error: No MGLRU generation data to plot.")
         return
 
     columns = ['Step'] + [f'Gen {i}' for i in range(num_generations)]
-    df = pd.DataFrame(generation_log, columns=columns)
+    df = pd.DataFrame(generation_log, columns=columns, dtype=np.int32)
     df = df.set_index('Step')
 
-    plt.figure(figsize=(15, 8))
+    owns_figure = ax is None
+    ax = _reset_axes(ax, (15, 8))
     
     try:
-        plt.stackplot(df.index, [df[col] for col in df.columns], labels=df.columns)
+        ax.stackplot(df.index.to_numpy(), df.to_numpy(dtype=np.float32).T, labels=df.columns.tolist())
     except Exception as e:
         print(f"Error plotting MGLRU stackplot: {e}")
+        if owns_figure:
+            plt.close(ax.figure)
         return
 
-    plt.title('MGLRU Generation Sizes Over Time', fontsize=16)
-    plt.xlabel('Simulation Step', fontsize=12)
-    plt.ylabel('Number of Pages (Total Frames)', fontsize=12)
-    plt.legend(loc='upper left')
-    plt.grid(True, linestyle='--', alpha=0.5)
+    ax.set_title('MGLRU Generation Sizes Over Time', fontsize=16)
+    ax.set_xlabel('Simulation Step', fontsize=12)
+    ax.set_ylabel('Number of Pages (Total Frames)', fontsize=12)
+    ax.legend(loc='upper left')
+    ax.grid(True, linestyle='--', alpha=0.5)
     
-    plt.xlim(0, df.index.max())
-    plt.ylim(0, df.sum(axis=1).max() * 1.1) 
+    ax.set_xlim(0, df.index.max())
+    ax.set_ylim(0, df.sum(axis=1).max() * 1.1) 
 
     try:
-        plt.savefig(filepath)
+        ax.figure.savefig(filepath, dpi=PLOT_DPI)
         print(f"[+] Success! MGLRU generation plot saved to: {filepath}")
     except Exception as e:
-        print(f"\n[-] Error saving MGLRU plot: {e}")
\ No newline at end of file
+        print(f"\n[-] Error saving MGLRU plot: {e}")
+    if owns_figure:
+        plt.close(ax.figure)
\ No newline at end of file
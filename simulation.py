@@ -1,12 +1,22 @@
-def run_single_process(algorithm_instance, workload, num_frames):
+import algorithms
+
+def run_single_process(algorithm_instance, workload, num_frames, context=None, record_timeline=True):
     
     algo = algorithm_instance
     
-   
-    for i, page_number in enumerate(workload):
-       
-        future_workload = workload[i+1:]
-        
-        algo.process_page_request(page_number, workload_future=future_workload)
-            
-    return algo.get_stats()
\ No newline at end of file
+    return algo.run_workload(workload, context, record_timeline)
+
+
+# Each comparison worker process builds the trace context once in its
+# initializer, so jobs only carry the algorithm class and frame count.
+_worker_context = None
+
+def init_comparison_worker(workload):
+    global _worker_context
+    _worker_context = algorithms.SimContext(workload)
+
+def run_comparison_job(alg_class, num_frames):
+    
+    algo_instance = alg_class(num_frames)
+    run_single_process(algo_instance, _worker_context.pages, num_frames, _worker_context, record_timeline=False)
+    return algo_instance.get_stats_raw()
@@ -1,16 +1,54 @@
-import random
+from array import array
+import mmap
+import os
+import re
+
+import numpy as np
+
+import algorithms_jit
+
+# Page numbers are tokens made only of digits, separated by commas or
+# whitespace; any other token is skipped.
+_DIGITS_AND_WHITESPACE = b'0123456789 \t\n\r\x0b\x0c'
+_SEPARATOR = re.compile(rb'[\s,]')
+_PAGE_TOKEN = re.compile(rb'(?<!\S)\d+(?!\S)')
+# Files are parsed through a read-only mapping in blocks of about this many
+# bytes, so only one block is ever copied out of the mapping at a time.
+_PARSE_BLOCK = 1 << 20
+
+def _parse_block(block):
+    # Returns the block's pages and how many malformed tokens it skipped.
+    block = block.replace(b',', b' ')
+    if not block.strip():
+        return np.empty(0, dtype=np.int64), 0
+    if not block.translate(None, _DIGITS_AND_WHITESPACE):
+        # Every token is a page number, so NumPy can parse the block in C.
+        return np.fromstring(block, dtype=np.int64, sep=' '), 0
+    tokens = _PAGE_TOKEN.findall(block)
+    return np.array(tokens, dtype=bytes).astype(np.int64), len(block.split()) - len(tokens)
 
 def parse_workload(filepath):
     
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        
-       
-        content = content.replace(',', ' ').replace('\n', ' ')
-        
-       
-        page_requests = [int(page) for page in content.split() if page.isdigit()]
+        page_requests = array('i')
+        skipped = 0
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    start = 0
+                    while start < len(mapped):
+                        # Each block ends just after a separator, so no token
+                        # is split between two blocks.
+                        cut = _SEPARATOR.search(mapped, min(start + _PARSE_BLOCK, len(mapped)))
+                        end = cut.end() if cut else len(mapped)
+                        pages, block_skipped = _parse_block(mapped[start:end])
+                        skipped += block_skipped
+                        if len(pages) and pages.max() > np.iinfo(np.intc).max:
+                            raise ValueError("page number too large")
+                        page_requests.frombytes(pages.astype(np.intc).tobytes())
+                        start = end
+        if skipped:
+            print(f"Warning: Skipped {skipped} malformed token(s) in workload file '{filepath}'.")
         
         if not page_requests:
             print(f"Warning: Workload file '{filepath}' is empty or has invalid format.")
@@ -25,75 +63,112 @@ def parse_workload(filepath):
         print(f"Error parsing workload file '{filepath}': {e}")
         return []
 
-def generate_workload(length, max_page_num, type='random'):
-    
+def precompute_next_use(page_requests):
+    # Index of the next request for the same page, or len(page_requests) if
+    # the page is never requested again.
+    n = len(page_requests)
+    next_use = np.empty(n, dtype=np.int64)
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        page = page_requests[i]
+        next_use[i] = last_seen.get(page, n)
+        last_seen[page] = i
+    return next_use
+
+WORKLOAD_TYPES = ('random', 'sequential', 'locality', 'zipf', 'sequential_strided')
+
+# Skew of the 'zipf' workload; page k is requested with weight (k + 1) ** -a.
+ZIPF_EXPONENT = 1.2
+# Stride of the 'sequential_strided' workload.
+SCAN_STRIDE = 4
+
+def _page_array(pages):
+    # Generated traces are stored as packed C ints instead of a list of
+    # boxed ints; iterating them still yields plain Python ints.
+    packed = array('i')
+    packed.frombytes(np.ascontiguousarray(pages, dtype=np.intc).tobytes())
+    return packed
+
+def _locality_walk(hot, offsets, jumps, max_page_num):
+    # Hot steps move by their offset, clamped to the page range; the rest
+    # jump straight to their page.
     page_requests = []
-    
+    current_page = 0
+    for is_hot, offset, jump in zip(hot.tolist(), offsets.tolist(), jumps.tolist()):
+        if is_hot:
+            current_page = max(0, min(current_page + offset, max_page_num))
+        else:
+            current_page = jump
+        page_requests.append(current_page)
+    return page_requests
+
+def generate_workload(length, max_page_num, type='random', rng=None):
+    # rng is a numpy Generator; pass a seeded one for a reproducible trace.
+    if rng is None:
+        rng = np.random.default_rng()
+
     if type == 'random':
-        for _ in range(length):
-            page_requests.append(random.randint(0, max_page_num))
+        page_requests = _page_array(rng.integers(0, max_page_num + 1, size=length, dtype=np.int32))
             
     elif type == 'sequential':
-        for i in range(length):
-            page_requests.append(i % (max_page_num + 1))
+        cycle = np.arange(max_page_num + 1, dtype=np.int32)
+        page_requests = _page_array(np.tile(cycle, length // (max_page_num + 1) + 1)[:length])
             
     elif type == 'locality':
         
         
         locality_size = max(1, max_page_num // 4) 
         
-        current_page = random.randint(0, max_page_num)
-        page_requests.append(current_page)
-        
-        for _ in range(length - 1):
-            if random.random() < 0.8:
-                offset = random.randint(-locality_size, locality_size)
-                next_page = current_page + offset
-               
-                next_page = max(0, min(next_page, max_page_num)) 
-                current_page = next_page
-            else: 
-                current_page = random.randint(0, max_page_num)
-                
-            page_requests.append(current_page)
+        # Every random draw is made up front; only the clamped walk itself
+        # has to be stepped through in order. The first request is always a
+        # jump to a random page.
+        hot = rng.random(length) < 0.8
+        hot[:1] = False
+        offsets = rng.integers(-locality_size, locality_size + 1, size=length)
+        jumps = rng.integers(0, max_page_num + 1, size=length)
+        if algorithms_jit.NUMBA_AVAILABLE:
+            page_requests = _page_array(algorithms_jit.locality_walk_kernel(hot, offsets, jumps, max_page_num))
+        else:
+            page_requests = _page_array(_locality_walk(hot, offsets, jumps, max_page_num))
+
+    elif type == 'zipf':
+        # Zipf truncated to the page range, so the tail is redrawn over the
+        # valid pages instead of piling up on the last one.
+        weights = np.arange(1, max_page_num + 2, dtype=np.float64) ** -ZIPF_EXPONENT
+        page_requests = _page_array(rng.choice(max_page_num + 1, size=length, p=weights / weights.sum()))
+
+    elif type == 'sequential_strided':
+        # Visits every SCAN_STRIDE-th page, then the next offset, and so on,
+        # so each pass still covers the whole range.
+        cycle = np.concatenate([np.arange(offset, max_page_num + 1, SCAN_STRIDE, dtype=np.int32)
+                                for offset in range(min(SCAN_STRIDE, max_page_num + 1))])
+        page_requests = _page_array(np.tile(cycle, length // (max_page_num + 1) + 1)[:length])
             
     else:
         raise ValueError(f"Unknown workload type: '{type}'")
         
     return page_requests
 
-def generate_multiprocess_workload(length, num_processes, max_page_per_process, type='locality'):
-  
-    trace = []
-    
-    process_generators = {}
-    for i in range(num_processes):
-        pid = i + 1
-        
-        process_generators[pid] = generate_workload(length, max_page_per_process, type)
+def generate_multiprocess_workload(length, num_processes, max_page_per_process, type='locality', rng=None):
+    # Returns the trace as two parallel int32 arrays: the pid of each request
+    # and the page it asks for within that process. Every per-process trace
+    # is drawn from the same rng.
+    if rng is None:
+        rng = np.random.default_rng()
+    pids = rng.integers(1, num_processes + 1, size=length, dtype=np.int32)
+    pages = np.empty(length, dtype=np.int32)
 
-   
-    process_indices = {pid: 0 for pid in range(1, num_processes + 1)}
+    # Each process's requests, in trace order, are the next entries of its
+    # own generated workload, so it only needs as many as it was picked.
+    order = np.argsort(pids, kind='stable')
+    counts = np.bincount(pids, minlength=num_processes + 1)[1:]
+    bounds = np.cumsum(counts)
+    for count, end in zip(counts.tolist(), bounds.tolist()):
+        pages[order[end - count:end]] = generate_workload(count, max_page_per_process, type, rng)
 
-    for _ in range(length):
-        
-        active_pid = random.randint(1, num_processes)
-        
-       
-        page_index = process_indices[active_pid]
-        
-        if page_index < length:
-            page_num = process_generators[active_pid][page_index]
-            trace.append((active_pid, page_num))
-            process_indices[active_pid] += 1
-        else:
-           
-            other_pid = (active_pid % num_processes) + 1
-            page_index = process_indices[other_pid]
-            if page_index < length:
-                page_num = process_generators[other_pid][page_index]
-                trace.append((other_pid, page_num))
-                process_indices[other_pid] += 1
-
-  
-    return trace[:length]
\ No newline at end of file
+    return pids, pages
+
+def global_page_keys(pids, pages):
+    # One int64 key per (pid, page) pair, so processes sharing a page number
+    # stay distinct without building a tuple per request.
+    return (np.asarray(pids, dtype=np.int64) << 32) | np.asarray(pages, dtype=np.int64)